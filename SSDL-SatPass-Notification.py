@@ -11,6 +11,7 @@
 #--------------------------------------------------------------------------------------------------#
 # coding 2026.02.24: 1st coding                                                                    #
 # update 2026.02.25: GitHub actions supported                                                      #
+# update 2026.10.14: concurrent retrieval of satellite passes                                      #
 #--------------------------------------------------------------------------------------------------#
 
 #--------------------------------------------------------------------------------------------------#
@@ -18,20 +19,36 @@
 #--------------------------------------------------------------------------------------------------#
 # Default Library
 from pathlib import Path
-import json, pickle, os, sys
-from datetime import datetime, timezone
+import io, json, pickle, os, sys, time, hashlib
+import asyncio, functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
-from time import sleep
 
 # Install requirements
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from astropy.table import Table, vstack
+from astropy.table import Table, MaskedColumn, vstack
+from astropy.io import ascii
 from astropy.time import Time, TimeDelta
 import astropy.units as u
 from astroplan import Observer
 
+# Optional library (orjson is a faster JSON encoder/decoder, json is used if not installed)
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = lambda obj: orjson.dumps(obj).decode()
+    json_dumps_pretty = lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    json_loads = json.loads
+    json_dumps = json.dumps
+    json_dumps_pretty = lambda obj: json.dumps(obj, indent=2, ensure_ascii=False)
+
 # Custom library
 from satphotometry_light import heavens_above,gettle
 
@@ -39,6 +56,14 @@ from satphotometry_light import heavens_above,gettle
 WEEKDAY_JP = ["月", "火", "水", "木", "金", "土", "日"]
 HEAVENS_ABOVE_URL = "https://www.heavens-above.com/"
 METEOBLUE_URL = "https://my.meteoblue.com/packages"
+MAX_SESSIONS = 4 # maximum number of satellites retrieved at the same time
+HA_INTERVAL  = 0.25 # interval between request starts of each session to heavens-above [sec]
+
+# Run time (UTC) shared by file names, iCalendar and Slack messages
+RUN_TIME   = Time.now()
+RUN_ISOT19 = RUN_TIME.isot[0:19] # YYYY-MM-DDThh:mm:ss
+RUN_ISO19  = RUN_TIME.iso[0:19]  # YYYY-MM-DD hh:mm:ss
+RUN_DATE   = RUN_TIME.isot[0:10] # YYYY-MM-DD
 
 #--------------------------------------------------------------------------------------------------#
 # PATH                                                                                             #
@@ -53,19 +78,24 @@ base_PATH   = str(BASE_DIR) + "/"
 output_PATH = str(BASE_DIR / "output" / "heavens-above")
 input_PATH  = str(BASE_DIR / "input" / "heavens-above")
 tmp_PATH    = str(BASE_DIR / "tmp" / "heavens-above")
+tle_PATH    = str(BASE_DIR / "tmp" / "heavens-above" / "tle")
 
 os.makedirs(output_PATH, exist_ok=True)
 os.makedirs(input_PATH, exist_ok=True)
 os.makedirs(tmp_PATH, exist_ok=True)
+os.makedirs(tle_PATH, exist_ok=True)
 
 #--------------------------------------------------------------------------------------------------#
 # Parameter                                                                                        #
 #--------------------------------------------------------------------------------------------------#
 # Satellite list
-from input.satlist.BRIGHT_LEO import *
+from input.satlist.BRIGHT_LEO import norad_ids
 
 # Observation site
-from input.obs_site.KUPT import *
+from input.obs_site.KUPT import obs_name, obs_timezone, obs_gd_lon_deg, obs_gd_lat_deg, obs_gd_height
+
+# Meteoblue pictcodes (see detail at https://docs.meteoblue.com/en/meteo/variables/pictograms)
+from input.weather.pictocode import pictocode_hourly
 
 # Satellite pass filter settings
 min_alt      = int(os.getenv("MIN_ALT", 30))        # minimum altitude of objects [deg] | int or float
@@ -77,6 +107,7 @@ send_notice     = True if os.getenv("SEND_NOTICE", "NOT") == "SEND" else False #
 slack_api_token = os.getenv("SLACK_TOKEN")   # Slack API token | str
 channel_id      = os.getenv("SLACK_CHANNEL") # Slack channel ID | str
 notify_type     = os.getenv("NOTIFY_TYPE", "bydate")   # Notification type; "bydate" or "bysat" | str
+force_upload    = True if os.getenv("SLACK_UPLOAD", "DIFF") == "FORCE" else False # Upload iCalendar file even if passes are not changed | bool
 
 # Meteoblue API settings
 meteoblue_api_key = os.getenv("METEOBLUE_API_KEY") # Meteoblue API key | str
@@ -101,63 +132,55 @@ offset = now_local.utcoffset()
 lst_h = offset.total_seconds() // 3600
 lst_m = (offset.total_seconds() % 3600) // 60
 
-#--------------------------------#
-# Heavens-Above                  #
-#--------------------------------#
-# [1] Get pass Summary
-#  -  Retrieve pass Summary- from www.heavens-above.com/PassSummary.aspx
-#  -  Progress display
-print()
-print("Retrieving satellite passes from heavens above...")
-print(" - Note : This may take several seconds")
+#  -  Local time offset shared by all UTC to local time conversions
+LST_DELTA = TimeDelta(offset.total_seconds() * u.s)
 
-#  -  Retrieve pass Summary
-pass_table = None
-for norad_id in norad_ids:
-    _,tle_result = gettle.celes_trak.get_latest_TLE(norad_id)
-    with open(f"{base_PATH}tmp/heavens-above/tle.txt","w") as f:
-        f.write(tle_result)
-    tle_dict = gettle.parse.parse_tles_file(f"{base_PATH}tmp/heavens-above/tle.txt")
-    satname = tle_dict[str(norad_id)][0]['name'].rstrip()
+#  -  Function to convert UTC column (isot) to local time
+def to_lst(utc_column) -> Time:
+    return Time(np.asarray(utc_column, dtype=str), format="isot") + LST_DELTA
 
-    query_result = heavens_above.get_pass_summary(norad_id,obs_gd_lon_deg,obs_gd_lat_deg,obs_gd_height,"UCT")
-    sat_pass_table = heavens_above.parse_summary2table(query_result,satname)
+#  -  Function to get local date of the night (YYYY-MM-DD)
+#  -  Evening pass and following morning pass share the same night
+def night_of(lst_times: Time) -> np.ndarray:
+    return (lst_times - 12*u.hour).isot.astype("U10")
 
-    if pass_table is None:
-        pass_table = sat_pass_table
-    else:
-        pass_table = vstack([pass_table, sat_pass_table])
-    
-    sleep(0.25) # Session interval
-
-#  -  Progress display
-print("Completed : Retrieve satellite passes from heavens above")
-
-# [2] Time window
-#  -  Determine observation time window (evening/morning)
-#  -  Progress display
-print()
-print("Processing data from heavens above...")
-
-#  -  Add time window & date to pass_table
-time_windows = []
-dates = []
-for row in pass_table:
-    obs_start = Time(row["start_utc"]).mjd
-    obs_noon = obs_obj.noon(Time(row["start_utc"]), which = "previous")
-    sun_horizon = obs_obj.tonight(obs_noon, horizon = 0 * u.deg)
-    sunset_lst  = sun_horizon[0].mjd
-    sunrise_lst = sun_horizon[1].mjd
-    if abs(obs_start-sunset_lst) < abs(obs_start-sunrise_lst):
-        time_windows.append("evening")
-    else:
-        time_windows.append("morning")
-    dates.append((Time(row["max_utc"]) + TimeDelta(lst_h*u.hour + lst_m*u.minute)).isot[0:10])
-pass_table["date"] = dates
-pass_table["time_window"] = time_windows
+#  -  Function to compute sunset and sunrise [mjd] of the night for given horizon [deg]
+#  -  Results are saved to ./tmp/heavens-above/sun_cache.pkl and keyed by observation site and night
+sun_cache_path = f"{tmp_PATH}/sun_cache.pkl"
+if os.path.exists(sun_cache_path):
+    with open(sun_cache_path, "rb") as f:
+        sun_cache = pickle.load(f)
+else:
+    sun_cache = {}
+
+#  -  Nights missing in cache are computed at once with array Time
+def prepare_sun_events(nights, horizon_deg: float) -> None:
+    missing = [night for night in np.unique(np.asarray(nights, dtype=str)) if (obs_gd_lat_deg, obs_gd_lon_deg, night, horizon_deg) not in sun_cache]
+    if not missing:
+        return
+    obs_noon = obs_obj.noon(Time([f"{night}T12:00:00" for night in missing]) - LST_DELTA, which = "nearest")
+    sunset, sunrise = obs_obj.tonight(obs_noon, horizon = horizon_deg * u.deg)
+    for night, sunset_mjd, sunrise_mjd in zip(missing, np.atleast_1d(sunset.mjd), np.atleast_1d(sunrise.mjd)):
+        sun_cache[(obs_gd_lat_deg, obs_gd_lon_deg, night, horizon_deg)] = (float(sunset_mjd), float(sunrise_mjd))
+
+@functools.lru_cache(maxsize=512)
+def sun_events(night: str, horizon_deg: float) -> tuple:
+    key = (obs_gd_lat_deg, obs_gd_lon_deg, str(night), horizon_deg)
+    if key not in sun_cache:
+        prepare_sun_events([night], horizon_deg)
+    return sun_cache[key]
 
-#  -  Progress display
-print("Completed : Process data from heavens above")
+#--------------------------------#
+# HTTP session                   #
+#--------------------------------#
+#  -  HTTP session shared by all requests to keep connections alive (gzip is accepted by default)
+#  -  Failed connections, 429 (rate limit) and 5xx responses of GET requests are retried up to 3 times (same as heavens_above)
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=2*MAX_SESSIONS,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
 
 #--------------------------------#
 # Meteoblue                      #
@@ -191,9 +214,9 @@ def fetch_meteoblue_10day_astropy(
     if asl is not None:
         params["asl"] = str(asl)
 
-    r = requests.get(url, params=params, timeout=timeout)
+    r = SESSION.get(url, params=params, timeout=timeout)
     r.raise_for_status()
-    payload = r.json()
+    payload = json_loads(r.content)
 
     tbl = Table()
     for key, values in payload["trend_1h"].items():
@@ -204,21 +227,24 @@ def fetch_meteoblue_10day_astropy(
 
     return tbl
 
-# [2] Get weather forecast
-#  -  Retrieve and parse 10 days weather forecast from Meteoblue
-#  -  Meteoblue forecast data PATH (./tmp/heavens-above/meteoblue/meteoblue_YYYY-MM-DD.csv)
-weather_path = f"{base_PATH}tmp/heavens-above/meteoblue/meteoblue_{Time.now().isot[0:10]}"
+# [2] Weather forecast function
+#  -  Meteoblue forecast data PATH (./tmp/heavens-above/meteoblue/meteoblue_YYYY-MM-DD_LATN_LONE.csv)
+#  -  Keyed by date and observation site, so that a moved site does not reuse forecast of the other site
+weather_path = f"{base_PATH}tmp/heavens-above/meteoblue/meteoblue_{RUN_DATE}_{obs_gd_lat_deg:.3f}N_{obs_gd_lon_deg:.3f}E"
+weather_pkl  = Path(f"{weather_path}.pkl")
 
-#  -  Retrieve or read weather forecast
 #  -  For saving API calls : weather data will be retrieved once in 24 hours
-if os.path.exists(f"{weather_path}.pkl") and (force_meteoblue is not True):
-    with open(f"{weather_path}.pkl", "rb") as f:
-        weather_table = pickle.load(f)
-
-else:
-    #  -  Progress display
-    print()
-    print("Retrieving weather forecast from meteoblue...")
+try:
+    weather_age = RUN_TIME.unix - weather_pkl.stat().st_mtime # [sec]
+except FileNotFoundError:
+    weather_age = float("inf")
+weather_cached = weather_age < 86400 and (force_meteoblue is not True)
+
+#  -  Function to retrieve or read 10 days weather forecast
+def get_weather_forecast() -> Table:
+    if weather_cached:
+        with weather_pkl.open("rb") as f:
+            return pickle.load(f)
 
     #  -  Retrieve weather forecast
     weather_table = fetch_meteoblue_10day_astropy(
@@ -231,106 +257,211 @@ else:
 
     #  -  Save history
     weather_table.write(f"{weather_path}.csv",overwrite=True)
-    with open(f"{weather_path}.pkl", 'wb') as f:
+    with weather_pkl.open("wb") as f:
         pickle.dump(weather_table, f)
-    
-    #  -  Progress display
+
+    return weather_table
+
+#--------------------------------#
+# Heavens-Above                  #
+#--------------------------------#
+# [1] Get pass Summary
+#  -  Retrieve pass Summary- from www.heavens-above.com/PassSummary.aspx
+#  -  Weather forecast from meteoblue is retrieved at the same time
+#  -  Progress display
+print()
+print("Retrieving satellite passes from heavens above...")
+print(" - Note : This may take several seconds")
+if not weather_cached:
+    print("Retrieving weather forecast from meteoblue...")
+
+#  -  Function to retrieve TLEs of all satellites
+#  -  TLE is only used for satellite name, so it is cached once a day (./tmp/heavens-above/tle/NORADID_YYYYMMDD.txt)
+#  -  TLEs missing in cache are retrieved with a single request to Celestrak
+#  -  TLEs are returned as text and parsed in memory
+def update_tles(norad_ids):
+    today = RUN_DATE.replace('-', '')
+    tle_paths = {norad_id: Path(tle_PATH) / f"{norad_id}_{today}.txt" for norad_id in norad_ids}
+    tle_texts = {norad_id: tle_path.read_text() for norad_id, tle_path in tle_paths.items() if tle_path.exists()}
+    missing_ids = [norad_id for norad_id in norad_ids if norad_id not in tle_texts]
+
+    if missing_ids:
+        _,tle_results = gettle.celes_trak.get_latest_TLEs(missing_ids, SESSION)
+
+        for norad_id, tle_result in tle_results.items():
+            old_tle_paths = sorted(Path(tle_PATH).glob(f"{norad_id}_*.txt"))
+            #  -  Keep TLE of previous days if celestrak.org failed to return TLE of today
+            if tle_result is None or str(norad_id) not in gettle.parse.parse_tles_string(tle_result):
+                if not old_tle_paths:
+                    raise RuntimeError(f"TLE of NORAD ID {norad_id} is not available from celestrak.org")
+                tle_texts[norad_id] = old_tle_paths[-1].read_text()
+                continue
+            #  -  Save TLE of today and remove TLE of previous days
+            for old_tle_path in old_tle_paths:
+                old_tle_path.unlink()
+            with open(tle_paths[norad_id],"w") as f:
+                f.write(tle_result)
+            tle_texts[norad_id] = tle_result
+
+    return tle_texts
+
+#  -  Function to retrieve pass Summary of a satellite
+#  -  Rate limit for heavens-above : at most MAX_SESSIONS requests start in each HA_INTERVAL
+#  -  Start time is reserved after a session is acquired (ha_starts holds the last MAX_SESSIONS start times)
+async def fetch_one(sem, ha_starts, norad_id):
+    async with sem:
+        now = asyncio.get_running_loop().time()
+        start = max(now, ha_starts[0] + HA_INTERVAL) if len(ha_starts) == MAX_SESSIONS else now
+        ha_starts.append(start)
+        await asyncio.sleep(start - now)
+        query_result = await heavens_above.get_pass_summary_async(norad_id, obs_gd_lon_deg, obs_gd_lat_deg, obs_gd_height, "UCT", SESSION)
+
+    return query_result
+
+#  -  Function to retrieve TLEs and pass Summary of all satellites
+#  -  TLEs and pass Summary are retrieved at the same time, blocking requests run in threads
+#  -  Number of satellites retrieved at the same time is limited by MAX_SESSIONS
+async def fetch_all_passes():
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(MAX_SESSIONS)
+    ha_starts = deque(maxlen=MAX_SESSIONS)
+    tle_texts, *query_results = await asyncio.gather(
+        loop.run_in_executor(None, update_tles, norad_ids),
+        *[fetch_one(sem, ha_starts, norad_id) for norad_id in norad_ids]
+    )
+
+    sat_pass_tables = []
+    for norad_id, query_result in zip(norad_ids, query_results):
+        tle_dict = gettle.parse.parse_tles_string(tle_texts[norad_id])
+        satname = tle_dict[str(norad_id)][0]['name'].rstrip()
+        sat_pass_table = heavens_above.parse_summary2table(query_result,satname)
+        if len(sat_pass_table) > 0:
+            sat_pass_tables.append(sat_pass_table)
+
+    #  -  Satellites without passes are skipped (an empty table is returned if none of satellites has passes)
+    if not sat_pass_tables:
+        return heavens_above.parse_summary2table("", "")
+    return vstack(sat_pass_tables, metadata_conflicts="silent")
+
+#  -  Function to retrieve pass Summary of all satellites and weather forecast at the same time
+#  -  Blocking requests run in a thread pool sized to the connection pool of SESSION
+async def fetch_passes_and_weather():
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=2*MAX_SESSIONS))
+    return await asyncio.gather(fetch_all_passes(), loop.run_in_executor(None, get_weather_forecast))
+
+#  -  Retrieve pass Summary and weather forecast
+pass_table, weather_table = asyncio.run(fetch_passes_and_weather())
+
+#  -  Progress display
+print("Completed : Retrieve satellite passes from heavens above")
+if not weather_cached:
     print("Completed : Retrieve weather forecast from meteoblue")
 
+# [2] Time window
+#  -  Determine observation time window (evening/morning)
+#  -  Progress display
+print()
+print("Processing data from heavens above...")
+
+#  -  Add time window & date to pass_table
+#  -  Sunset and sunrise are computed once per night, passes in the same night share the result
+start_lst_all = to_lst(pass_table["start_utc"])
+nights = night_of(start_lst_all)
+
+prepare_sun_events(nights, 0)
+unique_nights, night_idx = np.unique(nights, return_inverse=True)
+night_sun = np.array([sun_events(night, 0) for night in unique_nights]).reshape(-1, 2)
+sunset_lst  = night_sun[night_idx, 0]
+sunrise_lst = night_sun[night_idx, 1]
+obs_start = (start_lst_all - LST_DELTA).mjd
+
+pass_table["date"] = to_lst(pass_table["max_utc"]).isot.astype("U10")
+pass_table["time_window"] = np.where(np.abs(obs_start-sunset_lst) < np.abs(obs_start-sunrise_lst), "evening", "morning")
+
+#  -  Progress display
+print("Completed : Process data from heavens above")
+
 # [3] Process weather forecast
 #  -  Parse 10 days weather forecast and intergrate to pass_table
 #  -  Progress display
 print()
 print("Processing data from meteoblue...")
 
-#  -  Set canvas
-totalcloudcover = []
-highclouds = []
-midclouds = []
-lowclouds = []
-temperature = []
-windspeed = []
-pictocode = []
-
-#  -  Write canvas
-for row in pass_table:
-    idxs = np.where(weather_table["time"] == row["start_utc"][0:13]+":00:00")
-    if len(idxs) > 0:
-        idx = idxs[0][0]
-        totalcloudcover.append(weather_table[idx]["totalcloudcover"])
-        highclouds.append(weather_table[idx]["highclouds"])
-        midclouds.append(weather_table[idx]["midclouds"])
-        lowclouds.append(weather_table[idx]["lowclouds"])
-        temperature.append(weather_table[idx]["temperature"])
-        windspeed.append(weather_table[idx]["windspeed"])
-        pictocode.append(weather_table[idx]["pictocode"])
-    else:
-        totalcloudcover.append("N/A")
-        highclouds.append("N/A")
-        midclouds.append("N/A")
-        lowclouds.append("N/A")
-        temperature.append("N/A")
-        windspeed.append("N/A")
-        pictocode.append("N/A")
-
-#  -  Integrate weather data to pass_table
-pass_table["totalcloudcover"] = totalcloudcover
-pass_table["highclouds"] = highclouds
-pass_table["midclouds"] = midclouds
-pass_table["lowclouds"] = lowclouds
-pass_table["temperature"] = temperature
-pass_table["windspeed"] = windspeed
-pass_table["pictocode"] = pictocode
+#  -  Sorted weather forecast hours ("YYYY-MM-DDTHH")
+weather_hours = weather_table["time"].isot.astype("U13")
+weather_order = np.argsort(weather_hours, kind="stable")
+weather_hours = weather_hours[weather_order]
+
+#  -  Weather forecast row of each pass
+pass_hours = np.asarray(pass_table["start_utc"], dtype="U13")
+pos = np.clip(np.searchsorted(weather_hours, pass_hours), 0, len(weather_hours) - 1)
+available = weather_hours[pos] == pass_hours
+idxs = weather_order[pos]
+
+#  -  Integrate weather data to pass_table (masked : weather forecast not available)
+weather_columns = ["totalcloudcover", "highclouds", "midclouds", "lowclouds", "temperature", "windspeed", "pictocode"]
+for name in weather_columns:
+    pass_table[name] = MaskedColumn(np.asarray(weather_table[name])[idxs], mask=~available)
 
 #  -  Progress display
 print("Completed : Process data from meteoblue")
 
-# [4] Import Meteoblue pictcodes
-#  -  See detail at https://docs.meteoblue.com/en/meteo/variables/pictograms
-pictocode_hourly = {
-    1:  {"en": "Clear, cloudless sky",                                   "ja": "快晴（雲なし）",                         "emoji": "☀️"},
-    2:  {"en": "Clear, few cirrus",                                      "ja": "晴れ（薄い巻雲少し）",                  "emoji": "☀️"},
-    3:  {"en": "Clear with cirrus",                                      "ja": "晴れ（巻雲あり）",                      "emoji": "☀️"},
-    4:  {"en": "Clear with few low clouds",                              "ja": "晴れ（低い雲少し）",                    "emoji": "🌤️"},
-    5:  {"en": "Clear with few low clouds and few cirrus",               "ja": "晴れ（低い雲少し＋巻雲少し）",          "emoji": "🌤️"},
-    6:  {"en": "Clear with few low clouds and cirrus",                   "ja": "晴れ（低い雲少し＋巻雲あり）",          "emoji": "🌤️"},
-    7:  {"en": "Partly cloudy",                                          "ja": "晴れ時々曇り",                          "emoji": "⛅"},
-    8:  {"en": "Partly cloudy and few cirrus",                           "ja": "晴れ時々曇り（巻雲少し）",              "emoji": "⛅"},
-    9:  {"en": "Partly cloudy and cirrus",                               "ja": "晴れ時々曇り（巻雲あり）",              "emoji": "⛅"},
-    10: {"en": "Mixed with some thunderstorm clouds possible",           "ja": "晴れ/曇り（積乱雲の可能性）",            "emoji": "🌦️"},
-    11: {"en": "Mixed with few cirrus with some thunderstorm clouds possible",
-         "ja": "晴れ/曇り（巻雲少し＋積乱雲の可能性）",                   "emoji": "🌦️"},
-    12: {"en": "Mixed with cirrus with some thunderstorm clouds possible",
-         "ja": "晴れ/曇り（巻雲あり＋積乱雲の可能性）",                   "emoji": "🌦️"},
-    13: {"en": "Clear but hazy",                                         "ja": "晴れ（霞）",                            "emoji": "🌫️"},
-    14: {"en": "Clear but hazy with few cirrus",                         "ja": "晴れ（霞＋巻雲少し）",                  "emoji": "🌫️"},
-    15: {"en": "Clear but hazy with cirrus",                             "ja": "晴れ（霞＋巻雲あり）",                  "emoji": "🌫️"},
-    16: {"en": "Fog/low stratus clouds",                                 "ja": "霧 / 低い層雲",                         "emoji": "🌫️"},
-    17: {"en": "Fog/low stratus clouds with few cirrus",                 "ja": "霧/低い層雲（巻雲少し）",               "emoji": "🌫️"},
-    18: {"en": "Fog/low stratus clouds with cirrus",                     "ja": "霧/低い層雲（巻雲あり）",               "emoji": "🌫️"},
-    19: {"en": "Mostly cloudy",                                          "ja": "ほぼ曇り",                              "emoji": "☁️"},
-    20: {"en": "Mostly cloudy and few cirrus",                           "ja": "ほぼ曇り（巻雲少し）",                  "emoji": "☁️"},
-    21: {"en": "Mostly cloudy and cirrus",                               "ja": "ほぼ曇り（巻雲あり）",                  "emoji": "☁️"},
-    22: {"en": "Overcast",                                               "ja": "本曇り",                                "emoji": "☁️"},
-    23: {"en": "Overcast with rain",                                     "ja": "本曇り（雨）",                          "emoji": "🌧️"},
-    24: {"en": "Overcast with snow",                                     "ja": "本曇り（雪）",                          "emoji": "🌨️"},
-    25: {"en": "Overcast with heavy rain",                               "ja": "本曇り（強い雨）",                      "emoji": "🌧️🌧️"},
-    26: {"en": "Overcast with heavy snow",                               "ja": "本曇り（大雪）",                        "emoji": "❄️"},
-    27: {"en": "Rain, thunderstorms likely",                             "ja": "雨（雷の可能性）",                      "emoji": "⛈️"},
-    28: {"en": "Light rain, thunderstorms likely",                       "ja": "弱い雨（雷の可能性）",                  "emoji": "🌦️⛈️"},
-    29: {"en": "Storm with heavy snow",                                  "ja": "吹雪/嵐（大雪）",                       "emoji": "🌨️🌪️"},
-    30: {"en": "Heavy rain, thunderstorms likely",                       "ja": "強い雨（雷の可能性）",                  "emoji": "⛈️🌧️"},
-    31: {"en": "Mixed with showers",                                     "ja": "変わりやすい天気（にわか雨）",          "emoji": "🌦️"},
-    32: {"en": "Mixed with snow showers",                                "ja": "変わりやすい天気（にわか雪）",          "emoji": "🌨️"},
-    33: {"en": "Overcast with light rain",                               "ja": "本曇り（弱い雨）",                      "emoji": "🌦️"},
-    34: {"en": "Overcast with light snow",                               "ja": "本曇り（弱い雪）",                      "emoji": "🌨️"},
-    35: {"en": "Overcast with mixture of snow and rain",                 "ja": "本曇り（みぞれ/雨雪混在）",             "emoji": "🌧️❄️"},
-}
-
 #--------------------------------#
 # Save pass_table                #
 #--------------------------------#
-pass_table.write(f"{output_PATH}/SatPass.csv",overwrite=True)
+#  -  Weather not available is saved as "N/A"
+pass_table.write(f"{output_PATH}/SatPass.csv",overwrite=True,fill_values=[(ascii.masked, "N/A", *weather_columns)])
+
+#--------------------------------#
+# Filter pass_table              #
+#--------------------------------#
+#  -  Passes in good observation condition, shared by iCalendar and Slack messages
+good_mask = (pass_table["max_alt"] >= min_alt) & (pass_table["duration"] > min_duration) & (pass_table["visible"] == True)
+if time_window == "evening" or time_window == "morning":
+    good_mask &= (pass_table["time_window"] == time_window)
+good_pass_table = pass_table[good_mask]
+
+#--------------------------------#
+# Format good_pass_table         #
+#--------------------------------#
+#  -  Strings shared by iCalendar and Slack messages are formatted once for all good passes
+weather_ok = ~np.ma.getmaskarray(good_pass_table["totalcloudcover"])
+good_pass_table["weather_ok"] = weather_ok
+def _rjust3(name: str) -> np.ndarray:
+    return np.char.mod("%3s", np.asarray(good_pass_table[name], dtype=str))
+
+good_pass_table["mag_s"] = np.where(np.ma.getmaskarray(good_pass_table["mag"]), "None", np.asarray(good_pass_table["mag"].filled(np.nan), dtype=str))
+good_pass_table["duration_s"] = np.char.add(np.char.mod("%d min ", good_pass_table["duration"] // 60), np.char.mod("%d sec", good_pass_table["duration"] % 60))
+for name in ["start_alt", "max_alt", "end_alt"]:
+    good_pass_table[f"{name}_s"] = np.char.mod("%.0f°", np.asarray(good_pass_table[name], dtype=float))
+good_pass_table["cloud_desc"] = np.where(
+    weather_ok,
+    np.char.add(np.char.add(np.char.add(np.char.add(_rjust3("lowclouds"), "|"), _rjust3("midclouds")), "|"), _rjust3("highclouds")),
+    "N/A"
+)
+#  -  Meteoblue pictcodes as arrays indexed by pictocode (index 0 : weather not available)
+PICT_EMOJI = np.array([""] + [pictocode_hourly[code]["emoji"] for code in range(1, max(pictocode_hourly) + 1)], dtype=object)
+PICT_EN    = np.array([""] + [pictocode_hourly[code]["en"] for code in range(1, max(pictocode_hourly) + 1)], dtype=object)
+PICT_JA    = np.array([""] + [pictocode_hourly[code]["ja"] for code in range(1, max(pictocode_hourly) + 1)], dtype=object)
+
+pict_idx = good_pass_table["pictocode"].filled(0).astype(int)
+good_pass_table["pict"] = PICT_EMOJI[pict_idx]
+good_pass_table["pict_en"] = PICT_EN[pict_idx]
+good_pass_table["wind_desc"] = np.where(weather_ok, np.char.mod("%.1f mps", good_pass_table["windspeed"].filled(0).astype(float)), "N/A")
+
+#  -  Function to sort table by keys and get boundaries of groups of the first key (same as groups.indices)
+#  -  Rows with the same keys keep their order (stable sort)
+def sort_groups(table, keys: list) -> tuple:
+    order = np.lexsort([np.asarray(table[key], dtype=str) for key in reversed(keys)])
+    sorted_table = table[order]
+    first_key = np.asarray(sorted_table[keys[0]], dtype=str)
+    if len(first_key) == 0:
+        return sorted_table, np.array([0])
+    indices = np.concatenate([[0], np.flatnonzero(first_key[1:] != first_key[:-1]) + 1, [len(first_key)]])
+    return sorted_table, indices
+
+good_by_sat, good_by_sat_idx = sort_groups(good_pass_table, ["satname"])
 
 #--------------------------------#
 # iCalendar                      #
@@ -341,18 +472,15 @@ pass_table.write(f"{output_PATH}/SatPass.csv",overwrite=True)
 def _ics_dt(dt: datetime) -> str:
     return dt.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
 
-def _ics_lst_dt(dt: datetime) -> str:
-    return dt.strftime("%Y%m%dT%H%M%S")
+def _ics_lst_isot(isot: str) -> str:
+    # "YYYY-MM-DDThh:mm:ss(.sss)" -> "YYYYMMDDThhmmss"
+    return isot[0:4] + isot[5:7] + isot[8:10] + "T" + isot[11:13] + isot[14:16] + isot[17:19]
+
+_ICS_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", ";": r"\;", ",": r"\,", "\n": r"\n"})
 
 def _ics_escape(text: str) -> str:
-    text = str(text)
-    return (
-        text.replace("\\", "\\\\")
-            .replace(";", r"\;")
-            .replace(",", r"\,")
-            .replace("\r\n", r"\n")
-            .replace("\n", r"\n")
-    )
+    # CRLF is collapsed first so that it becomes a single escaped newline
+    return str(text).replace("\r\n", "\n").translate(_ICS_ESCAPE_TABLE)
 
 def _ics_escape_uri(uri: str) -> str:
     return str(uri).replace("\\", "\\\\")
@@ -360,29 +488,64 @@ def _ics_escape_uri(uri: str) -> str:
 def _fold_ics_line(line: str, limit: int = 75) -> str:
     if len(line) <= limit:
         return line
-    out = []
-    while len(line) > limit:
-        out.append(line[:limit])
-        line = " " + line[limit:]
-    out.append(line)
-    return "\r\n".join(out)
+    # continuation lines begin with a space, so they carry limit-1 characters
+    parts = [line[:limit]]
+    parts += [" " + line[i:i + limit - 1] for i in range(limit, len(line), limit - 1)]
+    return "\r\n".join(parts)
 
 #  -  function to make ics from pass_table 
 def write_passes_to_ics(pass_table, out_path, calendar_name: str = "Satellite Passes") -> str:
-    out_path
-    now_utc = datetime.now(timezone.utc)
-
-    lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        "PRODID:-//SatPhotometry//SatPass//EN",
-        "CALSCALE:GREGORIAN",
-        "METHOD:PUBLISH",
-        f"X-WR-CALNAME:{_ics_escape(calendar_name)}",
-    ]
+    now_utc = RUN_TIME.to_datetime(timezone=timezone.utc)
+
+    buf = io.StringIO()
+    buf.write(
+        "BEGIN:VCALENDAR\r\n"
+        "VERSION:2.0\r\n"
+        "PRODID:-//SatPhotometry//SatPass//EN\r\n"
+        "CALSCALE:GREGORIAN\r\n"
+        "METHOD:PUBLISH\r\n"
+        f"X-WR-CALNAME:{_ics_escape(calendar_name)}\r\n"
+    )
+
+    # Local time of all passes (converted at once)
+    start_lst_all = to_lst(pass_table["start_utc"])
+    start_lst_iso = start_lst_all.isot
+    max_lst_iso = to_lst(pass_table["max_utc"]).isot
+    end_lst_iso = to_lst(pass_table["end_utc"]).isot
+
+    # Sunset, astronomical dusk, astronomical dawn and sunrise of each night in local time
+    # Uncached nights are computed at once, then all events are converted to local time at once
+    nights = night_of(start_lst_all)
+    unique_nights = np.unique(nights)
+    prepare_sun_events(unique_nights, 0)
+    prepare_sun_events(unique_nights, -18)
+    sun_mjd = [[sun_events(night, 0)[0], *sun_events(night, -18), sun_events(night, 0)[1]] for night in unique_nights]
+    sun_hm = (Time(np.reshape(sun_mjd, -1), format="mjd") + LST_DELTA).isot.astype("U16").reshape(-1, 4) if len(sun_mjd) > 0 else []
+    sun_lst = {night: [t[11:16] for t in hm] for night, hm in zip(unique_nights, sun_hm)}
+
+    # Static parts of events are formatted once (footer of description is escaped beforehand)
+    desc_footer = _ics_escape(
+        f"Note : Weather data is updated every 24 hours\n"
+        f"----------------------------------------\n"
+        f"Data Provided by Heavens-Above / Meteoblue\n"
+        f"Updated at {RUN_ISOT19} (UTC)\n"
+        f"================================\n"
+        f"SSDL SatPass Notification System\n"
+        f" - with SatPhotometry Library\n"
+        f"(c) 2026 Kiyoaki Okudaira - Kyushu University\n"
+        f"================================"
+    )
+    dtstamp_line = f"DTSTAMP:{_ics_dt(now_utc)}"
+    location_lines = "".join(
+        _fold_ics_line(el) + "\r\n" for el in [
+            f"LOCATION:{obs_name}",
+            f"GEO:{obs_gd_lat_deg:.6f};{obs_gd_lon_deg:.6f}",
+            f"X-APPLE-STRUCTURED-LOCATION;VALUE=URI;X-APPLE-RADIUS=72;X-TITLE={obs_name}:geo:{obs_gd_lat_deg:.6f},{obs_gd_lon_deg:.6f}",
+        ]
+    )
 
     # Astropy Table rows can be iterated directly
-    for row in pass_table:
+    for i, row in enumerate(pass_table):
         satid = row["satid"]
         satname = row["satname"]
 
@@ -390,26 +553,24 @@ def write_passes_to_ics(pass_table, out_path, calendar_name: str = "Satellite Pa
 
         event_url = f"https://app.kiyoaki.jp/SatPhotometry-Palnner/SP-Planner.html?lon={obs_gd_lon_deg:.4f}&latitude={obs_gd_lat_deg:.4f}&altitude={int(obs_gd_height*1000)}&waveLength=5e-5&aperture=0.508&norad={satid}&startUTC={row["start_utc"][0:19]}&endUTC={row["end_utc"][0:19]}&step=1&lstHour={int(lst_h)}&lstMin={int(lst_m)}&run=True"
 
-        start_lst_obj = (Time(row["start_utc"]) + TimeDelta(lst_h*u.hour + lst_m*u.minute))
-        start_lst_time = start_lst_obj.isot[11:19]
-        max_lst_time = (Time(row["max_utc"]) + TimeDelta(lst_h*u.hour + lst_m*u.minute)).isot[11:19]
-        end_lst_obj = (Time(row["end_utc"]) + TimeDelta(lst_h*u.hour + lst_m*u.minute))
-        end_lst_time = (Time(row["end_utc"]) + TimeDelta(lst_h*u.hour + lst_m*u.minute)).isot[11:19]
+        start_lst_time = start_lst_iso[i][11:19]
+        max_lst_time = max_lst_iso[i][11:19]
+        end_lst_time = end_lst_iso[i][11:19]
 
-        start_lst_dt = start_lst_obj.to_datetime()
-        end_lst_dt = end_lst_obj.to_datetime()
+        sunset_lst, astro_dusk_lst, astro_dawn_lst, sunrise_lst = sun_lst[nights[i]]
 
-        obs_noon = obs_obj.noon(Time(row["start_utc"]), which = "previous")
-        sun_horizon = obs_obj.tonight(obs_noon, horizon = 0 * u.deg)
-        astro_twilight = obs_obj.tonight(obs_noon, horizon = -18 * u.deg)
-        sunset_lst  = (sun_horizon[0]+ TimeDelta(lst_h*u.hour + lst_m*u.minute)).isot[11:16]
-        sunrise_lst = (sun_horizon[1]+ TimeDelta(lst_h*u.hour + lst_m*u.minute)).isot[11:16]
-        astro_dusk_lst = (astro_twilight[0]+ TimeDelta(lst_h*u.hour + lst_m*u.minute)).isot[11:16]
-        astro_dawn_lst = (astro_twilight[1]+ TimeDelta(lst_h*u.hour + lst_m*u.minute)).isot[11:16]
+        pict = row["pict"]
+        pict_desc = row["pict_en"]
 
-        if row['totalcloudcover'] != "N/A":
-            pict = pictocode_hourly[row["pictocode"]]["emoji"]
-            pict_desc = pictocode_hourly[row["pictocode"]]["en"]
+        # Weather forecast (masked values are not formatted; "N/A" as in SatPass.csv)
+        if row["weather_ok"]:
+            weather_desc = (
+                f"Clouds : {row["totalcloudcover"]}% (L:{row["lowclouds"]} M:{row["midclouds"]} H:{row["highclouds"]})\n"
+                f"Temperature : {row["temperature"]:.0f} °C\n"
+                f"Wind : {row["windspeed"]:.1f} m/s\n"
+            )
+        else:
+            weather_desc = "Clouds : N/A\nTemperature : N/A\nWind : N/A\n"
 
         # Summary (event title)
         summary = f"{pict} {satname}"
@@ -419,8 +580,8 @@ def write_passes_to_ics(pass_table, out_path, calendar_name: str = "Satellite Pa
             f"================================\n"
             f"{satname} | NORAD ID {satid}\n"
             f"================================\n"
-            f"Mag : {row['mag']}\n"
-            f"Duration : {row['duration']//60} min {row['duration']%60} sec\n"
+            f"Mag : {row['mag_s']}\n"
+            f"Duration : {row['duration_s']}\n"
             f"Pass start : {start_lst_time} (el={row['start_alt']}° / {row['start_az']})\n"
             f"Highest : {max_lst_time} (el={row['max_alt']}° / {row['max_az']})\n"
             f"Pass end : {end_lst_time} (el={row['end_alt']}° / {row['end_az']})\n"
@@ -431,45 +592,34 @@ def write_passes_to_ics(pass_table, out_path, calendar_name: str = "Satellite Pa
             f"Sunrise : {sunrise_lst}\n"
             f"----------------------------------------\n"
             f"{pict} {pict_desc}\n"
-            f"Clouds : {row["totalcloudcover"]}% (L:{row["lowclouds"]} M:{row["midclouds"]} H:{row["highclouds"]})\n"
-            f"Temperature : {row["temperature"]:.0f} °C\n"
-            f"Wind : {row["windspeed"]:.1f} m/s\n"
-            f"Note : Weather data is updated every 24 hours\n"
-            f"----------------------------------------\n"
-            f"Data Provided by Heavens-Above / Meteoblue\n"
-            f"Updated at {Time.now().isot[0:19]} (UTC)\n"
-            f"================================\n"
-            f"SSDL SatPass Notification System\n"
-            f" - with SatPhotometry Library\n"
-            f"(c) 2026 Kiyoaki Okudaira - Kyushu University\n"
-            f"================================"
+            f"{weather_desc}"
         )
         uid = f"{satid}.{row["mjd"]:.1f}@SatPass"
 
-        event_lines = [
-            "BEGIN:VEVENT",
+        # Fold long lines
+        buf.write("BEGIN:VEVENT\r\n")
+        for el in [
             f"UID:{uid}",
-            f"DTSTAMP:{_ics_dt(now_utc)}",
-            f"DTSTART;TZID={obs_timezone}:{_ics_lst_dt(start_lst_dt)}",
-            f"DTEND;TZID={obs_timezone}:{_ics_lst_dt(end_lst_dt)}",
+            dtstamp_line,
+            f"DTSTART;TZID={obs_timezone}:{_ics_lst_isot(start_lst_iso[i])}",
+            f"DTEND;TZID={obs_timezone}:{_ics_lst_isot(end_lst_iso[i])}",
             f"SUMMARY:{_ics_escape(summary)}",
-            f"LOCATION:{obs_name}",
-            f"GEO:{obs_gd_lat_deg:.6f};{obs_gd_lon_deg:.6f}",
-            f"X-APPLE-STRUCTURED-LOCATION;VALUE=URI;X-APPLE-RADIUS=72;X-TITLE={obs_name}:geo:{obs_gd_lat_deg:.6f},{obs_gd_lon_deg:.6f}",
+        ]:
+            buf.write(_fold_ics_line(el))
+            buf.write("\r\n")
+        buf.write(location_lines)
+        for el in [
             f"URL:{_ics_escape_uri(event_url)}",
-            f"DESCRIPTION:{_ics_escape(desc)}",
-            "END:VEVENT",
-        ]
+            f"DESCRIPTION:{_ics_escape(desc)}{desc_footer}",
+        ]:
+            buf.write(_fold_ics_line(el))
+            buf.write("\r\n")
+        buf.write("END:VEVENT\r\n")
 
-        # Fold long lines
-        for el in event_lines:
-            lines.append(_fold_ics_line(el))
+    buf.write("END:VCALENDAR\r\n")
 
-    lines.append("END:VCALENDAR")
-
-    ics_text = "\r\n".join(lines) + "\r\n"
     with open(out_path, "w", encoding="utf-8", newline="") as f:
-        f.write(ics_text)
+        f.write(buf.getvalue())
 
     return out_path
 
@@ -478,15 +628,14 @@ def write_passes_to_ics(pass_table, out_path, calendar_name: str = "Satellite Pa
 print()
 print("Writing ics file...")
 
-#  -  Pass filtering
-if time_window == "evening" or time_window == "morning":
-    good_pass_table = pass_table[(pass_table["max_alt"] >= min_alt) & (pass_table["duration"] > min_duration) & (pass_table["visible"] == True) & (pass_table["time_window"] == time_window)]
-else:
-    good_pass_table = pass_table[(pass_table["max_alt"] >= min_alt) & (pass_table["duration"] > min_duration) & (pass_table["visible"] == True)]
-good_pass_table = good_pass_table.group_by("satname")
-
 #  -  Write and save iCalendar file
-out_file = write_passes_to_ics(good_pass_table, out_path=f"{output_PATH}/SatPass.ics")
+out_file = write_passes_to_ics(good_by_sat, out_path=f"{output_PATH}/SatPass.ics")
+
+#  -  Save sun events of this site from yesterday onward for next run
+yesterday = (now_local - timedelta(days=1)).strftime("%Y-%m-%d")
+sun_cache = {k: v for k, v in sun_cache.items() if k[0:2] == (obs_gd_lat_deg, obs_gd_lon_deg) and k[2] >= yesterday}
+with open(sun_cache_path, "wb") as f:
+    pickle.dump(sun_cache, f)
 
 #  -  Progress display
 print("Completed : Write ics file")
@@ -505,6 +654,33 @@ print("Completed : Write ics file")
 print()
 print("Writing Slack messages...")
 
+#  -  Function to get weekday of local times (MJD 0 is Wednesday)
+def lst_weekday(lst_times) -> np.ndarray:
+    return np.asarray(WEEKDAY_JP)[(np.floor(lst_times.mjd).astype(int) + 2) % 7]
+
+#  -  Function to format table rows of passes; each row is prefix + Start, Highest, End, Clouds and Wind columns
+#  -  Columns are padded for all rows at once
+def slack_table_rows(group, prefix) -> list[str]:
+    rows = np.asarray(prefix, dtype=str)
+    for key in ["start", "max", "end"]:
+        lst_time = np.char.partition(to_lst(group[f"{key}_utc"]).isot.astype("U19"), "T")[:, 2]
+        alt_az = np.char.add(np.char.add(np.asarray(group[f"{key}_alt_s"], dtype=str), " "), np.asarray(group[f"{key}_az"], dtype=str))
+        rows = np.char.add(rows, np.char.ljust(np.char.add(np.char.add(np.char.add(lst_time, " ("), alt_az), ")"), 19))
+    rows = np.char.add(rows, np.char.ljust(np.asarray(group["cloud_desc"], dtype=str), 12))
+    rows = np.char.add(rows, np.asarray(group["wind_desc"], dtype=str))
+    return rows.tolist()
+
+#  -  Function to write header lines and table rows as one code block
+def slack_code_block(header, rows) -> str:
+    buf = io.StringIO()
+    buf.write("```")
+    buf.write("\n".join(header))
+    for row in rows:
+        buf.write("\n")
+        buf.write(row)
+    buf.write("```")
+    return buf.getvalue()
+
 #  -  Title and header
 slack_contents = []
 lines = []
@@ -517,56 +693,39 @@ slack_contents.append(lines)
 
 #  -  "bysat"  : Satellite passes is displayed by satellite
 if notify_type == "bysat":
-    for group in pass_table.groups:
+    #  -  Table rows of all good passes are formatted at once, then sliced by satellite
+    good_rows, good_slices = [], {}
+    if len(good_by_sat) > 0:
+        start_lst_all = to_lst(good_by_sat["start_utc"])
+        date_prefix = np.char.add(np.char.add(np.char.add(start_lst_all.isot.astype("U10"), " "), lst_weekday(start_lst_all)), "曜日 ")
+        good_rows = slack_table_rows(good_by_sat, date_prefix)
+        good_slices = {str(good_by_sat["satname"][start]): (start, stop) for start, stop in zip(good_by_sat_idx[:-1], good_by_sat_idx[1:])}
+
+    #  -  Number of passes of each satellite
+    satnames, first_idx, n_passes = np.unique(np.asarray(pass_table["satname"], dtype=str), return_index=True, return_counts=True)
+
+    for satname, first, n_pass in zip(satnames, first_idx, n_passes):
         lines = []
-        satname = group[0]["satname"]
-        norad_id = group[0]["satid"]
+        norad_id = pass_table["satid"][first]
 
-        if len(pass_table) > 0:
-            lines.append(f"*{satname} (NORAD ID {norad_id})* は直近10日間で{len(group)}件の観測可能な上空通過が予測されています．")
+        if n_pass > 0:
+            lines.append(f"*{satname} (NORAD ID {norad_id})* は直近10日間で{n_pass}件の観測可能な上空通過が予測されています．")
         else:
             lines.append(f"*{satname} (NORAD ID {norad_id})* は直近10日間に観測可能な上空通過がありません．")
         
-        if time_window == "evening" or time_window == "morning":
-            good_condition = (group["max_alt"] > 30) & (group["duration"] > 120) & (group["visible"] == True) & (pass_table["time_window"] == time_window)
-        else:
-            good_condition = (group["max_alt"] > 30) & (group["duration"] > 120) & (group["visible"] == True)
+        start, stop = good_slices.get(satname, (0, 0))
 
-        if np.sum(good_condition) > 0:
-            lines.append(f"良い観測条件の上空通過({np.sum(good_condition)}件)は以下の通りです．")
+        if stop > start:
+            lines.append(f"良い観測条件の上空通過({stop - start}件)は以下の通りです．")
             lines.append("")
 
-            table_lines = []
-            table_lines.append("　　　            Start              Highest            End                Clouds      Wind")
-            table_lines.append("観測日            LST      (ALT AZ)  LST      (ALT AZ)  LST      (ALT AZ)   L | M | H  Speed")
-
-            for row in group[good_condition]:
-                start_lst_obj = (Time(row["start_utc"]) + TimeDelta(lst_h*u.hour + lst_m*u.minute))
-                start_lst_weekday = WEEKDAY_JP[start_lst_obj.to_datetime().weekday()]
-                start_lst_date = start_lst_obj.isot[0:10]
-                start_lst_time = start_lst_obj.isot[11:19]
-
-                max_lst_time = (Time(row["max_utc"]) + TimeDelta(lst_h*u.hour + lst_m*u.minute)).isot[11:19]
-                end_lst_time = (Time(row["end_utc"]) + TimeDelta(lst_h*u.hour + lst_m*u.minute)).isot[11:19]
-
-                if row['totalcloudcover'] == "N/A":
-                    cloud_desc = "N/A"
-                    wind_desc = "N/A"
-                else:
-                    cloud_desc = f"{row['lowclouds']}".rjust(3)+f"|"+f"{row['midclouds']}".rjust(3)+f"|"+f"{row['highclouds']}".rjust(3)
-                    wind_desc = f"{row['windspeed']:.1f} mps"
-
-                table_lines.append(
-                    f"{start_lst_date} {start_lst_weekday}曜日 "
-                    + f"{start_lst_time} ({row['start_alt']:.0f}° {row['start_az']})".ljust(19)
-                    + f"{max_lst_time} ({row['max_alt']:.0f}° {row['max_az']})".ljust(19)
-                    + f"{end_lst_time} ({row['end_alt']:.0f}° {row['end_az']})".ljust(19)
-                    + f"{cloud_desc}".ljust(12)
-                    + f"{wind_desc}"
-                )
+            table_header = [
+                "　　　            Start              Highest            End                Clouds      Wind",
+                "観測日            LST      (ALT AZ)  LST      (ALT AZ)  LST      (ALT AZ)   L | M | H  Speed",
+            ]
 
             # Code block
-            lines.append("```" + "\n".join(table_lines) + "```")
+            lines.append(slack_code_block(table_header, good_rows[start:stop]))
         else:
             lines.append("良い観測条件の上空通過はありません．")
         lines.append("")
@@ -574,66 +733,43 @@ if notify_type == "bysat":
 
 #  -  "bydate" : Satellite passes is displayed by date (recommended)
 if notify_type == "bydate":
-    if time_window == "evening" or time_window == "morning":
-        good_pass_table = pass_table[(pass_table["max_alt"] >= min_alt) & (pass_table["duration"] > min_duration) & (pass_table["visible"] == True) & (pass_table["time_window"] == time_window)]
-    else:
-        good_pass_table = pass_table[(pass_table["max_alt"] >= min_alt) & (pass_table["duration"] > min_duration) & (pass_table["visible"] == True)]
-    good_pass_table.sort("start_utc")
-    good_pass_table = good_pass_table.group_by("date")
+    good_by_date, good_idx = sort_groups(good_pass_table, ["date", "start_utc"])
+
+    if len(good_by_date) > 0:
+        #  -  Table rows and weekdays of all good passes are formatted at once, then sliced by date
+        good_rows = slack_table_rows(good_by_date, np.char.ljust(np.asarray(good_by_date["satname"], dtype=str), 21))
+        good_weekdays = lst_weekday(to_lst(good_by_date["start_utc"]))
+        good_weather_ok = ~np.ma.getmaskarray(good_by_date["totalcloudcover"])
 
-    if len(good_pass_table) > 0:
-        for group in good_pass_table.groups:
+        for start, stop in zip(good_idx[:-1], good_idx[1:]):
             lines = []
-            date = group[0]["date"]
-            start_lst_obj = (Time(group[0]["start_utc"]) + TimeDelta(lst_h*u.hour + lst_m*u.minute))
-            start_lst_weekday = WEEKDAY_JP[start_lst_obj.to_datetime().weekday()]
-            lines.append(f"*{date[0:4]}年{date[5:7]}月{date[8:10]}日 {start_lst_weekday}曜日*")
-
-            weather_available = group[group["totalcloudcover"] != "N/A"]
-            if len(weather_available) > 0:
-                cloud_min = np.min(weather_available["totalcloudcover"])
-                cloud_max = np.max(weather_available["totalcloudcover"])
-                cloud_avg = np.mean(weather_available["totalcloudcover"])
-                pict = pictocode_hourly[np.max(weather_available["pictocode"])]["emoji"]
-                pict_desc = pictocode_hourly[np.max(weather_available["pictocode"])]["ja"]
-                wind_avg = np.mean(weather_available["windspeed"])
-                temp_avg = np.mean(weather_available["temperature"])
+            date = good_by_date["date"][start]
+            lines.append(f"*{date[0:4]}年{date[5:7]}月{date[8:10]}日 {good_weekdays[start]}曜日*")
+
+            weather_available = good_weather_ok[start:stop]
+            if np.any(weather_available):
+                clouds = good_by_date["totalcloudcover"][start:stop][weather_available]
+                pictocode = np.max(good_by_date["pictocode"][start:stop][weather_available])
+                cloud_min = np.min(clouds)
+                cloud_max = np.max(clouds)
+                cloud_avg = np.mean(clouds)
+                pict = PICT_EMOJI[pictocode]
+                pict_desc = PICT_JA[pictocode]
+                wind_avg = np.mean(good_by_date["windspeed"][start:stop][weather_available])
+                temp_avg = np.mean(good_by_date["temperature"][start:stop][weather_available])
                 lines.append(f"{pict} {pict_desc} | {temp_avg:.0f}°C | Wind {wind_avg:.1f}mps | Clouds max:{cloud_max}% avg:{cloud_avg:.0f}% min:{cloud_min}%")
             
-            lines.append(f"注目すべき衛星の良い観測条件の上空通過が{len(group)}件予測されています．")
+            lines.append(f"注目すべき衛星の良い観測条件の上空通過が{stop - start}件予測されています．")
 
             lines.append("")
 
-            table_lines = []
-            table_lines.append(f"{date}           Start              Highest            End                Clouds      Wind")
-            table_lines.append(f"Satellite            LST      (ALT AZ)  LST      (ALT AZ)  LST      (ALT AZ)   L | M | H  Speed")
-            for row in group:
-                start_lst_obj = (Time(row["start_utc"]) + TimeDelta(lst_h*u.hour + lst_m*u.minute))
-                start_lst_weekday = WEEKDAY_JP[start_lst_obj.to_datetime().weekday()]
-                start_lst_date = start_lst_obj.isot[0:10]
-                start_lst_time = start_lst_obj.isot[11:19]
-
-                max_lst_time = (Time(row["max_utc"]) + TimeDelta(lst_h*u.hour + lst_m*u.minute)).isot[11:19]
-                end_lst_time = (Time(row["end_utc"]) + TimeDelta(lst_h*u.hour + lst_m*u.minute)).isot[11:19]
-
-                if row['totalcloudcover'] == "N/A":
-                    cloud_desc = "N/A"
-                    wind_desc = "N/A"
-                else:
-                    cloud_desc = f"{row['lowclouds']}".rjust(3)+f"|"+f"{row['midclouds']}".rjust(3)+f"|"+f"{row['highclouds']}".rjust(3)
-                    wind_desc = f"{row['windspeed']:.1f} mps"
-
-                table_lines.append(
-                    f"{row["satname"]}".ljust(21) 
-                    + f"{start_lst_time} ({row['start_alt']:.0f}° {row['start_az']})".ljust(19)
-                    + f"{max_lst_time} ({row['max_alt']:.0f}° {row['max_az']})".ljust(19)
-                    + f"{end_lst_time} ({row['end_alt']:.0f}° {row['end_az']})".ljust(19)
-                    + f"{cloud_desc}".ljust(12)
-                    + f"{wind_desc}"
-                )
+            table_header = [
+                f"{date}           Start              Highest            End                Clouds      Wind",
+                f"Satellite            LST      (ALT AZ)  LST      (ALT AZ)  LST      (ALT AZ)   L | M | H  Speed",
+            ]
 
             # Code block
-            lines.append("```" + "\n".join(table_lines) + "```")
+            lines.append(slack_code_block(table_header, good_rows[start:stop]))
 
             lines.append("")
             slack_contents.append(lines)
@@ -643,16 +779,15 @@ if notify_type == "bydate":
         lines.append("")
         slack_contents.append(lines)
 
-#  -  footer
-lines = []
-lines.append(f"📅 <https://github.com/kiyo-astro/SSDL-SatPass-Notification/raw/refs/heads/main/output/heavens-above/SatPass.ics|*カレンダーをダウンロード*>")
-lines.append(f"URLを照会カレンダーとして Appleカレンダー または Googleカレンダー に登録・表示できます．")
-lines.append(f"照会カレンダーの登録方法は<https://github.com/kiyo-astro/SSDL-SatPass-Notification/blob/main/README.md|こちら>")
-lines.append(f"")
-lines.append(f"Data Provided by <https://www.heavens-above.com|Heavens-Above> / <https://www.meteoblue.com/en/weather/week/{obs_gd_lat_deg:.3f}N/{obs_gd_lon_deg:.3f}E|Meteoblue> / <https://github.com/kiyo-astro/satphotometry/|SatPhotometry Library>")
-lines.append(f"This message is automatically sent by <https://github.com/kiyo-astro/SSDL-SatPass-Notification|SSDL SatPass Notification System>")
-lines.append(f"Created at {Time.now().iso[0:19]} (UTC)")
-slack_contents.append(lines)
+#  -  footer (one block of lines)
+footer = f"""📅 <https://github.com/kiyo-astro/SSDL-SatPass-Notification/raw/refs/heads/main/output/heavens-above/SatPass.ics|*カレンダーをダウンロード*>
+URLを照会カレンダーとして Appleカレンダー または Googleカレンダー に登録・表示できます．
+照会カレンダーの登録方法は<https://github.com/kiyo-astro/SSDL-SatPass-Notification/blob/main/README.md|こちら>
+
+Data Provided by <https://www.heavens-above.com|Heavens-Above> / <https://www.meteoblue.com/en/weather/week/{obs_gd_lat_deg:.3f}N/{obs_gd_lon_deg:.3f}E|Meteoblue> / <https://github.com/kiyo-astro/satphotometry/|SatPhotometry Library>
+This message is automatically sent by <https://github.com/kiyo-astro/SSDL-SatPass-Notification|SSDL SatPass Notification System>
+Created at {RUN_ISO19} (UTC)"""
+slack_contents.append([footer])
 
 #  -  Progress display
 print("Completed : Write Slack messages. Preview will be displayed below.")
@@ -691,16 +826,36 @@ if send_notice:
     # comment title (for the uploaded file)
     title = os.path.basename(file_path)
 
-    def slack_api_post(url: str, token: str, data=None, files=None, timeout=60):
-        r = requests.post(
-            url,
-            headers={"Authorization": f"Bearer {token}"},
-            data=data,
-            files=files,
-            timeout=timeout,
-        )
+    # iCalendar file is uploaded only if it is changed since the last upload (or SLACK_UPLOAD is "FORCE")
+    # run time (DTSTAMP and "Updated at") is excluded from the SHA-256 hash
+    hash_path = Path(f"{file_path}.sha256")
+    ics_text = Path(file_path).read_bytes().decode("utf-8").replace("\r\n ", "")
+    for run_stamp in [_ics_dt(RUN_TIME.to_datetime(timezone=timezone.utc)), RUN_ISOT19]:
+        ics_text = ics_text.replace(run_stamp, "")
+    ics_hash = hashlib.sha256(ics_text.encode("utf-8")).hexdigest()
+    upload_ics = force_upload or not hash_path.exists() or hash_path.read_text().strip() != ics_hash
+    if not upload_ics:
+        print("iCalendar file is not changed since the last upload : upload is skipped")
+
+    # one keep-alive session for all Slack API calls
+    slack_session = requests.Session()
+    slack_session.headers.update({"Authorization": f"Bearer {slack_api_token}"})
+
+    # Slack API calls are retried on rate limit (429 : wait for Retry-After) and server errors (5xx : exponential backoff)
+    def slack_api_post(url: str, data=None, files=None, timeout=60, max_retries=5):
+        for attempt in range(max_retries + 1):
+            r = slack_session.post(
+                url,
+                data=data,
+                files=files,
+                timeout=timeout,
+            )
+            if attempt < max_retries and (r.status_code == 429 or r.status_code >= 500):
+                time.sleep(float(r.headers.get("Retry-After", 1)) if r.status_code == 429 else 0.5 * 2**attempt)
+                continue
+            break
         r.raise_for_status()
-        payload = r.json()
+        payload = json_loads(r.content)
         if not payload.get("ok", False):
             raise RuntimeError(f"Slack API error: {payload}")
         return payload
@@ -712,11 +867,10 @@ if send_notice:
     for i, batch in enumerate(batches):
         text = _format_batch(batch)
 
-        if i < len(batches) - 1:
-            # Text-only message
+        if i < len(batches) - 1 or not upload_ics:
+            # Text-only message (last message is also text-only if iCalendar file is not changed)
             slack_api_post(
                 "https://slack.com/api/chat.postMessage",
-                token=slack_api_token,
                 data={
                     "channel": channel_id,
                     "text": text+" -",
@@ -733,7 +887,6 @@ if send_notice:
 
             get_url_payload = slack_api_post(
                 "https://slack.com/api/files.getUploadURLExternal",
-                token=slack_api_token,
                 data={
                     "filename": filename,
                     "length": str(file_size),  # bytes
@@ -742,11 +895,11 @@ if send_notice:
             upload_url = get_url_payload["upload_url"]
             file_id = get_url_payload["file_id"]
 
-            # upload file
+            # upload file (streamed from disk; the upload URL is pre-signed, so no token is sent)
             with open(file_path, "rb") as f:
-                upload_resp = requests.post(
+                upload_resp = slack_session.post(
                     upload_url,
-                    headers={"Content-Type": "application/octet-stream"},
+                    headers={"Authorization": None, "Content-Type": "application/octet-stream"},
                     data=f,
                     timeout=300,
                 )
@@ -755,14 +908,15 @@ if send_notice:
             # confirm file share
             complete_payload = slack_api_post(
                 "https://slack.com/api/files.completeUploadExternal",
-                token=slack_api_token,
                 data={
-                    "files": json.dumps([{"id": file_id, "title": title}]),
+                    "files": json_dumps([{"id": file_id, "title": title}]),
                     "channel_id": channel_id,
                     "initial_comment": content,
                 },
             )
 
+            hash_path.write_text(ics_hash)
+
             # Progress display
             print("Uploaded OK")
-            print(json.dumps(complete_payload, indent=2, ensure_ascii=False))
\ No newline at end of file
+            print(json_dumps_pretty(complete_payload))
\ No newline at end of file
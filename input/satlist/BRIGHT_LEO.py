@@ -11,7 +11,7 @@
 #--------------------------------------------------------------------------------------------------#
 # coding 2025.12.08: 1st coding                                                                    #
 #--------------------------------------------------------------------------------------------------#
-norad_ids = [
+norad_ids = (
     20580,  # HST
     25544,  # ISS
     27386,  # ENVISAT
@@ -26,7 +26,7 @@ norad_ids = [
     61049,  # SPACEMOBILE-004
     61046,  # SPACEMOBILE-005
     67232   # SPACEMOBILE-006
-]
+)
 
 ftitle = "BRIGHT_LEO"   # Satellites list title for file name | str
 legend_view = "OBJNAME" # "INTLDES" or "OBJNAME", for plot | str
@@ -0,0 +1,52 @@
+#--------------------------------------------------------------------------------------------------#
+# pictocode.py                                                                                     #
+# Developed by Kiyoaki Okudaira * Kyushu University                                                #
+#--------------------------------------------------------------------------------------------------#
+# Description                                                                                      #
+#--------------------------------------------------------------------------------------------------#
+# Meteoblue hourly pictogram codes for SSDL SatPass Notification                                   #
+# See detail at https://docs.meteoblue.com/en/meteo/variables/pictograms                           #
+#--------------------------------------------------------------------------------------------------#
+# History                                                                                          #
+#--------------------------------------------------------------------------------------------------#
+# coding 2026.10.14: 1st coding (moved from SSDL-SatPass-Notification.py)                          #
+#--------------------------------------------------------------------------------------------------#
+pictocode_hourly = {
+    1:  {"en": "Clear, cloudless sky",                                   "ja": "快晴（雲なし）",                         "emoji": "☀️"},
+    2:  {"en": "Clear, few cirrus",                                      "ja": "晴れ（薄い巻雲少し）",                  "emoji": "☀️"},
+    3:  {"en": "Clear with cirrus",                                      "ja": "晴れ（巻雲あり）",                      "emoji": "☀️"},
+    4:  {"en": "Clear with few low clouds",                              "ja": "晴れ（低い雲少し）",                    "emoji": "🌤️"},
+    5:  {"en": "Clear with few low clouds and few cirrus",               "ja": "晴れ（低い雲少し＋巻雲少し）",          "emoji": "🌤️"},
+    6:  {"en": "Clear with few low clouds and cirrus",                   "ja": "晴れ（低い雲少し＋巻雲あり）",          "emoji": "🌤️"},
+    7:  {"en": "Partly cloudy",                                          "ja": "晴れ時々曇り",                          "emoji": "⛅"},
+    8:  {"en": "Partly cloudy and few cirrus",                           "ja": "晴れ時々曇り（巻雲少し）",              "emoji": "⛅"},
+    9:  {"en": "Partly cloudy and cirrus",                               "ja": "晴れ時々曇り（巻雲あり）",              "emoji": "⛅"},
+    10: {"en": "Mixed with some thunderstorm clouds possible",           "ja": "晴れ/曇り（積乱雲の可能性）",            "emoji": "🌦️"},
+    11: {"en": "Mixed with few cirrus with some thunderstorm clouds possible",
+         "ja": "晴れ/曇り（巻雲少し＋積乱雲の可能性）",                   "emoji": "🌦️"},
+    12: {"en": "Mixed with cirrus with some thunderstorm clouds possible",
+         "ja": "晴れ/曇り（巻雲あり＋積乱雲の可能性）",                   "emoji": "🌦️"},
+    13: {"en": "Clear but hazy",                                         "ja": "晴れ（霞）",                            "emoji": "🌫️"},
+    14: {"en": "Clear but hazy with few cirrus",                         "ja": "晴れ（霞＋巻雲少し）",                  "emoji": "🌫️"},
+    15: {"en": "Clear but hazy with cirrus",                             "ja": "晴れ（霞＋巻雲あり）",                  "emoji": "🌫️"},
+    16: {"en": "Fog/low stratus clouds",                                 "ja": "霧 / 低い層雲",                         "emoji": "🌫️"},
+    17: {"en": "Fog/low stratus clouds with few cirrus",                 "ja": "霧/低い層雲（巻雲少し）",               "emoji": "🌫️"},
+    18: {"en": "Fog/low stratus clouds with cirrus",                     "ja": "霧/低い層雲（巻雲あり）",               "emoji": "🌫️"},
+    19: {"en": "Mostly cloudy",                                          "ja": "ほぼ曇り",                              "emoji": "☁️"},
+    20: {"en": "Mostly cloudy and few cirrus",                           "ja": "ほぼ曇り（巻雲少し）",                  "emoji": "☁️"},
+    21: {"en": "Mostly cloudy and cirrus",                               "ja": "ほぼ曇り（巻雲あり）",                  "emoji": "☁️"},
+    22: {"en": "Overcast",                                               "ja": "本曇り",                                "emoji": "☁️"},
+    23: {"en": "Overcast with rain",                                     "ja": "本曇り（雨）",                          "emoji": "🌧️"},
+    24: {"en": "Overcast with snow",                                     "ja": "本曇り（雪）",                          "emoji": "🌨️"},
+    25: {"en": "Overcast with heavy rain",                               "ja": "本曇り（強い雨）",                      "emoji": "🌧️🌧️"},
+    26: {"en": "Overcast with heavy snow",                               "ja": "本曇り（大雪）",                        "emoji": "❄️"},
+    27: {"en": "Rain, thunderstorms likely",                             "ja": "雨（雷の可能性）",                      "emoji": "⛈️"},
+    28: {"en": "Light rain, thunderstorms likely",                       "ja": "弱い雨（雷の可能性）",                  "emoji": "🌦️⛈️"},
+    29: {"en": "Storm with heavy snow",                                  "ja": "吹雪/嵐（大雪）",                       "emoji": "🌨️🌪️"},
+    30: {"en": "Heavy rain, thunderstorms likely",                       "ja": "強い雨（雷の可能性）",                  "emoji": "⛈️🌧️"},
+    31: {"en": "Mixed with showers",                                     "ja": "変わりやすい天気（にわか雨）",          "emoji": "🌦️"},
+    32: {"en": "Mixed with snow showers",                                "ja": "変わりやすい天気（にわか雪）",          "emoji": "🌨️"},
+    33: {"en": "Overcast with light rain",                               "ja": "本曇り（弱い雨）",                      "emoji": "🌦️"},
+    34: {"en": "Overcast with light snow",                               "ja": "本曇り（弱い雪）",                      "emoji": "🌨️"},
+    35: {"en": "Overcast with mixture of snow and rain",                 "ja": "本曇り（みぞれ/雨雪混在）",             "emoji": "🌧️❄️"},
+}
@@ -11,6 +11,7 @@
 # copied 2025.12.07: from astroKUBO_lib                                                            #
 # update 2026.01.27: get_past_TLE function added                                                   #
 # bugfix 2026.05.10: support celestrak.org orbital elements format changes                         #
+# update 2026.10.14: session option, get_latest_TLEs and parse_tles_string functions added         #
 #--------------------------------------------------------------------------------------------------#
 
 #--------------------------------------------------------------------------------------------------#
@@ -228,7 +229,8 @@ class space_track:
 
 class celes_trak:
     def get_latest_TLE(
-            norad_id: int
+            norad_id: int,
+            session: requests.Session | None = None
             ):
         """
         Get latest Two-Line Element set from space-track.org
@@ -237,6 +239,8 @@ class celes_trak:
         ----------
         norad_id: `int` or `str`
             NORAD catalog number
+        session: `requests.Session` or `None`
+            HTTP session to reuse connections. Default is None (new session)
 
         Returns
         -------
@@ -250,7 +254,7 @@ class celes_trak:
             (c) 2025 Kiyoaki Okudaira - Kyushu University Hanada Lab (SSDL) / IAU CPS SatHub
         """
         # Start Session
-        session = requests.Session()
+        session = session or requests.Session()
 
         # Get TLE data
         query_url = (
@@ -266,6 +270,63 @@ class celes_trak:
 
         return response.status_code,tle_result
 
+    def get_latest_TLEs(
+            norad_ids: list,
+            session: requests.Session | None = None
+            ):
+        """
+        Get latest Two-Line Element sets of multiple satellites from celestrak.org in one request
+
+        Parameters
+        ----------
+        norad_ids: `list` of `int` or `str`
+            NORAD catalog numbers
+        session: `requests.Session` or `None`
+            HTTP session to reuse connections. Default is None (new session)
+
+        Returns
+        -------
+        response.status_code: `int`
+            status code of bulk query
+        tle_results: `dict`
+            Two-Line Element set of each NORAD catalog number (None if not available in both bulk and single query)
+
+        Notes
+        -----
+            (c) 2025 Kiyoaki Okudaira - Kyushu University Hanada Lab (SSDL) / IAU CPS SatHub
+        """
+        # Start Session
+        session = session or requests.Session()
+
+        # Get TLE data of all satellites
+        query_url = (
+            "https://celestrak.org/NORAD/elements/gp.php?CATNR={0}&FORMAT=TLE".format(",".join(str(norad_id) for norad_id in norad_ids))
+        )
+
+        response = session.get(query_url, stream=True)
+
+        # Split TLE data by NORAD catalog number (name line + line 1 + line 2)
+        tle_sets = {}
+        if response.status_code == 200:
+            lines = [ln for ln in response.text.splitlines(keepends=True) if ln.strip()]
+            for i in range(1, len(lines) - 1):
+                if lines[i].startswith("1 ") and lines[i + 1].startswith("2 "):
+                    name = lines[i - 1] if not lines[i - 1].startswith(("1 ", "2 ")) else ""
+                    tle_sets[lines[i][2:7]] = name + lines[i] + lines[i + 1]
+
+        # Fall back to single request for satellites missing in bulk query
+        tle_results = {}
+        for norad_id in norad_ids:
+            tle_result = tle_sets.get(str(norad_id).rjust(5, "0"))
+            if tle_result is None:
+                _,tle_result = celes_trak.get_latest_TLE(norad_id, session)
+                # Discard response without TLE of the satellite (e.g. "No GP data found")
+                if tle_result is not None and str(norad_id) not in parse.parse_tles_string(tle_result):
+                    tle_result = None
+            tle_results[norad_id] = tle_result
+
+        return response.status_code,tle_results
+
 class parse:
     def parse_tles_file(
             tle_path: str
@@ -288,7 +349,31 @@ class parse:
             (c) 2025 Kiyoaki Okudaira - Kyushu University Hanada Lab (SSDL) / IAU CPS SatHub
         """
         with open(tle_path, "r", encoding="utf-8") as f:
-            lines = [ln.rstrip("\n") for ln in f if ln.strip()]
+            tle_text = f.read()
+
+        return parse.parse_tles_string(tle_text)
+
+    def parse_tles_string(
+            tle_text: str
+            ):
+        """
+        Parse string with multiple Two-Line Element Sets
+
+        Parameters
+        ----------
+        tle_text: `str`
+            Two-Line Element Sets (e.g. response of Celestrak or content of TLE file)
+
+        Returns
+        -------
+        tle_dict: `dict`
+            parsed Two-Line Elements Sets ("name", "line1", "line2", "epoch")
+
+        Notes
+        -----
+            (c) 2025 Kiyoaki Okudaira - Kyushu University Hanada Lab (SSDL) / IAU CPS SatHub
+        """
+        lines = [ln for ln in tle_text.splitlines() if ln.strip()]
 
         tle_dict = {}
 
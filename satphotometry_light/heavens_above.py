@@ -9,21 +9,23 @@
 # History                                                                                          #
 #--------------------------------------------------------------------------------------------------#
 # coding 2026.02.13: 1st coding                                                                    #
+# update 2026.10.14: async functions, session option and shared session added                      #
 #--------------------------------------------------------------------------------------------------#
 
 #--------------------------------------------------------------------------------------------------#
 # Libraries                                                                                        #
 #--------------------------------------------------------------------------------------------------#
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import asyncio
+import functools
 import re
 import html
 import numpy as np
 import math
-from urllib.parse import urlparse, parse_qs
 
-from astropy.time import Time, TimeDelta
-from astropy.table import Table
-import astropy.units as u
+# astropy is imported in parse_summary2table (not required to retrieve pages)
 
 #--------------------------------------------------------------------------------------------------#
 # Main                                                                                             #
@@ -33,12 +35,77 @@ PASSDETAIL_URL   = "https://www.heavens-above.com/passdetails.aspx"
 PASSSKYCHART_URL = "https://www.heavens-above.com/PassSkyChart2.ashx"
 SKYCHART_URL     = "https://www.heavens-above.com/wholeskychart.ashx"
 
+# Regular expressions to parse pages of heavens-above.com (compiled once)
+_TR_RE      = re.compile(r'<tr\s+class="clickableRow".*?</tr>', re.DOTALL)
+_TD_RE      = re.compile(r"<td[^>]*>(.*?)</td>", re.DOTALL)
+_TAG_RE     = re.compile(r"<.*?>")
+_HREF_RE    = re.compile(r'<a[^>]+href="([^"]*passdetails\.aspx[^"]*)"')
+_ONCLICK_RE = re.compile(r"window\.location\s*=\s*'([^']*passdetails\.aspx[^']*)'")
+_MJD_RE     = re.compile(r'passdetails\.aspx\?[^"\']*?\bmjd=([0-9.]+)\b')
+_SATID_RE   = re.compile(r"[?&]satid=(\d+)")
+_QS_MJD_RE  = re.compile(r"[?&]mjd=([\d.]+)")
+_ALT_RE     = re.compile(r"-?\d+(?:\.\d+)?")
+_PASSID_RE  = re.compile(r'PassSkyChart2\.ashx\?[^"\']*\bpassID=(\d+)\b')
+
+# Keep-alive session shared by all requests to heavens-above.com (used if session is not given)
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        )
+    )
+
+@functools.lru_cache(maxsize=8)
+def _obs_params(
+        obs_gd_lon_deg: float,
+        obs_gd_lat_deg: float,
+        obs_gd_height: float,
+        ha_timezone: str
+        ):
+    """
+    Query parameters of observation site shared by all heavens-above.com queries
+
+    Parameters
+    ----------
+    obs_gd_lon_deg: `float`
+        Geodetic longitude [deg]
+    obs_gd_lat_deg: `float`
+        Geodetic latitude [deg]
+    obs_gd_height: `float`
+        Geodetic height [km]
+    ha_timezone: `str`
+        Pass Chart display timezone
+
+    Returns
+    -------
+    query_params: `dict`
+        Query parameters (lat, lng, loc, alt, tz)
+
+    Notes
+    -----
+        Cached for each observation site, returned dict must be copied (e.g. {**_obs_params(...)}) before changes.
+        (c) 2026 Kiyoaki Okudaira - University of Washington / IAU CPS SatHub
+    """
+    query_params = {
+        "lat"   : f"{obs_gd_lat_deg:.6f}",
+        "lng"   : f"{obs_gd_lon_deg:.6f}",
+        "loc"   : "Unspecified",
+        "alt"   : f"{obs_gd_height*1000:.0f}",
+        "tz"    : f"{ha_timezone}"
+        }
+
+    return query_params
+
 def get_pass_summary(
         norad_id: int | str,
         obs_gd_lon_deg: float,
         obs_gd_lat_deg: float,
         obs_gd_height: float,
-        ha_timezone: str ="UCT"
+        ha_timezone: str ="UCT",
+        session: requests.Session | None = None
         ):
     """
     Get satellite pass summary from heavens-above.com
@@ -55,6 +122,8 @@ def get_pass_summary(
         Geodetic height [km]
     ha_timezone: `str`
         Pass Chart display timezone. Default is "UCT"
+    session: `requests.Session` or `None`
+        HTTP session to reuse connections. Default is None (module session)
 
     Returns
     -------
@@ -67,14 +136,10 @@ def get_pass_summary(
     """
     query_params = {
         "satid" : f"{norad_id:.0f}",
-        "lat"   : f"{obs_gd_lat_deg:.6f}",
-        "lng"   : f"{obs_gd_lon_deg:.6f}",
-        "loc"   : "Unspecified",
-        "alt"   : f"{obs_gd_height*1000:.0f}",
-        "tz"    : f"{ha_timezone}"
+        **_obs_params(obs_gd_lon_deg, obs_gd_lat_deg, obs_gd_height, ha_timezone)
         }
 
-    r = requests.get(PASSSUMMARY_URL, params=query_params)
+    r = (session or _SESSION).get(PASSSUMMARY_URL, params=query_params)
     r.raise_for_status()
     query_result = r.text
 
@@ -94,16 +159,18 @@ def parse_summary2mjd(
     Returns
     -------
     mjds: `np.ndarray`
-        Satellite pass MJD list
+        Satellite pass MJD list (sorted, without duplicates)
 
     Notes
     -----
         (c) 2026 Kiyoaki Okudaira - University of Washington / IAU CPS SatHub
     """
+    if "passdetails" not in query_result:
+        return np.empty(0, dtype=np.float64)
+
     s = html.unescape(query_result)
-    mjd_strs = re.findall(r'passdetails\.aspx\?[^"\']*?\bmjd=([0-9.]+)\b', s)
-    mjds = [float(x) for x in mjd_strs]
-    mjds = np.array(list(dict.fromkeys(mjds)))
+    mjd_strs = _MJD_RE.findall(s)
+    mjds = np.unique(np.fromiter(map(float, mjd_strs), dtype=np.float64, count=len(mjd_strs)))
 
     return mjds
 
@@ -130,38 +197,41 @@ def parse_summary2table(
     -----
         (c) 2026 Kiyoaki Okudaira - University of Washington / IAU CPS SatHub
     """    
+    from astropy.time import Time
+    from astropy.table import Table, MaskedColumn
+
     # internal functions
-    def _strip_tags(s: str) -> str:
-        return re.sub(r"<.*?>", "", s).strip()
+    _tag_sub = _TAG_RE.sub
+    _td_findall = _TD_RE.findall
+    _alt_findall = _ALT_RE.findall
 
+    def _strip_tags(s: str) -> str:
+        return _tag_sub("", s).strip()
 
-    def _strip_deg(s: str) -> float:
-        return float(s.replace("°", "").strip())
+    def _hms2sec(times: list) -> np.ndarray:
+        # "HH:MM:SS" -> seconds of day
+        return np.array([int(h)*3600 + int(m)*60 + int(sec) for h, m, sec in (t.split(":") for t in times)], dtype=np.int64)
 
 
     def _extract_passdetails_url(tr_html: str) -> str:
         # 1) <a href="...">
-        m = re.search(r'<a[^>]+href="([^"]*passdetails\.aspx[^"]*)"', tr_html)
+        m = _HREF_RE.search(tr_html)
         if m:
-            return html.unescape(m.group(1))
+            return m.group(1)
 
         # 2) onclick="window.location='...'"
-        m = re.search(r"window\.location\s*=\s*'([^']*passdetails\.aspx[^']*)'", tr_html)
+        m = _ONCLICK_RE.search(tr_html)
         if m:
-            return html.unescape(m.group(1))
+            return m.group(1)
 
         return ""
 
-    def _qs_get_first(qs, key, default=None):
-        v = qs.get(key)
-        if not v:
-            return default
-        return v[0]
-    tr_list = re.findall(
-        r'<tr\s+class="clickableRow".*?</tr>',
-        query_result,
-        flags=re.DOTALL
-    )
+    # HTML entities (e.g. "&amp;" in URLs) are unescaped once for the whole page
+    # Page without passes is not parsed (empty table is returned)
+    if "clickableRow" in query_result:
+        tr_list = _TR_RE.findall(html.unescape(query_result))
+    else:
+        tr_list = []
 
     # output canvas
     cols = {
@@ -185,78 +255,49 @@ def parse_summary2table(
 
     for tr_html in tr_list:
 
-        url = _extract_passdetails_url(tr_html)
-
-        tds = re.findall(r"<td[^>]*>(.*?)</td>", tr_html, flags=re.DOTALL)
-        tds_text = [_strip_tags(x) for x in tds]
+        tds = _td_findall(tr_html)
 
-        if len(tds_text) < 12:
+        # row with less cells is skipped before stripping tags, then only used cells are stripped
+        if len(tds) < 12:
             continue
 
-        date_str = tds_text[0]
+        url = _extract_passdetails_url(tr_html)
+
+        date_str = _strip_tags(tds[0])
         try:
-            brightness = float(tds_text[1])
+            brightness = float(_strip_tags(tds[1]))
         except:
-            brightness = None
+            brightness = float("nan")
 
-        start_time = tds_text[2]
-        start_alt = _strip_deg(tds_text[3])
-        start_az = tds_text[4]
+        # altitudes (e.g. "10°") of start, max and end are parsed at once
+        start_alt, max_alt, end_alt = map(float, _alt_findall(f"{_strip_tags(tds[3])} {_strip_tags(tds[6])} {_strip_tags(tds[9])}"))
 
-        max_time = tds_text[5]
-        max_alt = _strip_deg(tds_text[6])
-        max_az = tds_text[7]
+        start_time = _strip_tags(tds[2])
+        start_az = _strip_tags(tds[4])
 
-        end_time = tds_text[8]
-        end_alt = _strip_deg(tds_text[9])
-        end_az = tds_text[10]
+        max_time = _strip_tags(tds[5])
+        max_az = _strip_tags(tds[7])
 
-        pass_type = tds_text[11]
+        end_time = _strip_tags(tds[8])
+        end_az = _strip_tags(tds[10])
+
+        pass_type = _strip_tags(tds[11])
         if pass_type == "visible":
             pass_type = True
         else:
             pass_type = False
 
         # PassDetail query
-        qs = parse_qs(urlparse(url).query) if url else {}
-
-        satid = _qs_get_first(qs, "satid", None)
-        mjd = _qs_get_first(qs, "mjd", None)
-        # pass_kind = _qs_get_first(qs, "type", "")
-
-        satid_i = int(satid) if satid is not None else -1
-        mjd_f = float(mjd) if mjd is not None else float("nan")
-
-        max_time_obj = Time(mjd_f, format="mjd", scale="utc")
-        max_time = max_time_obj.isot[:11] + max_time
-        max_time_obj = Time(max_time)
-
-        start_time = max_time_obj.isot[:11] + start_time
-        start_time_obj = Time(start_time)
-        end_time = max_time_obj.isot[:11] + end_time
-        end_time_obj = Time(end_time)
-
-        duration = (end_time_obj - start_time_obj).sec
-        # duration_min = int(duration // 60)
-        # duration_sec = int(duration % 60)
-
-        # duration_f = f"{duration_min:02d}:{duration_sec:02d}"
-
-        if start_time_obj > max_time_obj:
-            start_time_obj - TimeDelta(1 * u.day)
-        if end_time_obj < max_time_obj:
-            end_time_obj + TimeDelta(1 * u.day)
-
-        start_time = start_time_obj.isot[0:19]
-        max_time = max_time_obj.isot[0:19]
-        end_time = end_time_obj.isot[0:19]
+        m = _SATID_RE.search(url)
+        satid_i = int(m.group(1)) if m else -1
+        m = _QS_MJD_RE.search(url)
+        mjd_f = float(m.group(1)) if m else float("nan")
 
         # output
         # cols["date_str"].append(date_str)
         cols["satid"].append(satid_i)
         cols["satname"].append(satname)
         cols["mag"].append(brightness)
-        cols["duration"].append(int(duration))
         cols["start_utc"].append(start_time)
         cols["start_alt"].append(start_alt)
         cols["start_az"].append(start_az)
@@ -270,11 +311,44 @@ def parse_summary2table(
         cols["detail_url"].append(url)
         cols["mjd"].append(mjd_f)
         # cols["pass_kind"].append(pass_kind)
+
+    # pass times and duration of all rows at once (date of max time is given by mjd)
+    if len(cols["mjd"]) > 0:
+        max_date = Time(np.asarray(cols["mjd"], dtype=float), format="mjd", scale="utc").isot.astype("U10").astype("datetime64[D]")
+        start_sec = _hms2sec(cols["start_utc"])
+        max_sec = _hms2sec(cols["max_utc"])
+        end_sec = _hms2sec(cols["end_utc"])
+
+        # passes across midnight : start on the previous day / end on the next day
+        start_day = np.where(start_sec > max_sec, -1, 0)
+        end_day = np.where(end_sec < max_sec, 1, 0)
+
+        cols["duration"] = ((end_sec + 86400*end_day) - (start_sec + 86400*start_day)).tolist()
+        cols["start_utc"] = np.char.add(np.char.add((max_date + start_day).astype(str), "T"), cols["start_utc"]).tolist()
+        cols["max_utc"] = np.char.add(np.char.add(max_date.astype(str), "T"), cols["max_utc"]).tolist()
+        cols["end_utc"] = np.char.add(np.char.add((max_date + end_day).astype(str), "T"), cols["end_utc"]).tolist()
     
-    pass_table = Table(
-        cols,
-        dtype=[object, object, object, object, object, object, object, object, object, object, object, object, object, object, object, object]
-        )
+    # typed columns (mag is masked if brightness is not available)
+    dtypes = {
+        "satid": np.int64,
+        "satname": str,
+        "mag": np.float64,
+        "duration": np.int64,
+        "start_utc": "U19",
+        "start_alt": np.float64,
+        "start_az": str,
+        "max_utc": "U19",
+        "max_alt": np.float64,
+        "max_az": str,
+        "end_utc": "U19",
+        "end_alt": np.float64,
+        "end_az": str,
+        "visible": bool,
+        "detail_url": str,
+        "mjd": np.float64
+    }
+    pass_table = Table({key: np.asarray(cols[key], dtype=dtypes[key]) for key in cols})
+    pass_table["mag"] = MaskedColumn(pass_table["mag"], mask=np.isnan(pass_table["mag"]))
 
     return pass_table
 
@@ -284,7 +358,8 @@ def get_pass_detail(
         obs_gd_lat_deg: float,
         obs_gd_height: float,
         ha_mjd: float,
-        ha_timezone: str = "UCT"
+        ha_timezone: str = "UCT",
+        session: requests.Session | None = None
         ):
     """
     Get satellite pass detail from heavens-above.com
@@ -303,6 +378,8 @@ def get_pass_detail(
         MJD at start of satellite pass
     ha_timezone: `str`
         Pass Chart display timezone. Default is "UCT"
+    session: `requests.Session` or `None`
+        HTTP session to reuse connections. Default is None (module session)
 
     Returns
     -------
@@ -314,17 +391,13 @@ def get_pass_detail(
         (c) 2026 Kiyoaki Okudaira - University of Washington / IAU CPS SatHub
     """
     query_params = {
-        "lat"   : f"{obs_gd_lat_deg:.6f}",
-        "lng"   : f"{obs_gd_lon_deg:.6f}",
-        "loc"   : "Unspecified",
-        "alt"   : f"{obs_gd_height*1000:.0f}",
-        "tz"    : f"{ha_timezone}",
+        **_obs_params(obs_gd_lon_deg, obs_gd_lat_deg, obs_gd_height, ha_timezone),
         "satid" : f"{norad_id:.0f}",
         "mjd"   : f"{ha_mjd}",
         "type"  : "V"
         }
 
-    r = requests.get(PASSDETAIL_URL, params=query_params)
+    r = (session or _SESSION).get(PASSDETAIL_URL, params=query_params)
     r.raise_for_status()
     query_result = r.text
 
@@ -350,7 +423,7 @@ def parse_detail2passid(
     -----
         (c) 2026 Kiyoaki Okudaira - University of Washington / IAU CPS SatHub
     """
-    m = re.search(r'PassSkyChart2\.ashx\?[^"\']*\bpassID=(\d+)\b', query_result)
+    m = _PASSID_RE.search(query_result)
     if not m:
         raise ValueError("Error : Pass SKY Chart not found")
     pass_id = m.group(1)
@@ -363,7 +436,8 @@ def get_pass_chart(
         obs_gd_lat_deg: float,
         obs_gd_height: float,
         ha_timezone: str = "UCT",
-        ha_imgsize: int = 800
+        ha_imgsize: int = 800,
+        session: requests.Session | None = None
         ):
     """
     Get satellite pass detail from heavens-above.com
@@ -382,6 +456,8 @@ def get_pass_chart(
         Pass Chart display timezone. Default is "UCT"
     ha_timezone: `int`
         Pass Chart image size [pix]. Default is 800
+    session: `requests.Session` or `None`
+        HTTP session to reuse connections. Default is None (module session)
 
     Returns
     -------
@@ -395,15 +471,11 @@ def get_pass_chart(
     query_params = {
         "passID"    : f"{pass_id}",
         "size"      : f"{ha_imgsize:.0f}",
-        "lat"       : f"{obs_gd_lat_deg:.6f}",
-        "lng"       : f"{obs_gd_lon_deg:.6f}",
-        "loc"       : "Unspecified",
-        "alt"       : f"{obs_gd_height*1000:.0f}",
-        "tz"        : f"{ha_timezone}",
+        **_obs_params(obs_gd_lon_deg, obs_gd_lat_deg, obs_gd_height, ha_timezone),
         "showUnlit" : "false"
         }
 
-    r = requests.get(PASSSKYCHART_URL, params=query_params)
+    r = (session or _SESSION).get(PASSSKYCHART_URL, params=query_params)
     r.raise_for_status()
     query_result = r.content
 
@@ -415,7 +487,8 @@ def get_wholeskychart(
         obs_gd_height: float,
         ha_mjd: float,
         ha_timezone: str = "UCT",
-        ha_imgsize: int = 800
+        ha_imgsize: int = 800,
+        session: requests.Session | None = None
         ):
     """
     Get satellite pass detail from heavens-above.com
@@ -434,6 +507,8 @@ def get_wholeskychart(
         Pass Chart display timezone. Default is "UCT"
     ha_timezone: `int`
         Pass Chart image size [pix]. Default is 800
+    session: `requests.Session` or `None`
+        HTTP session to reuse connections. Default is None (module session)
 
     Returns
     -------
@@ -446,11 +521,7 @@ def get_wholeskychart(
     """
     "lat=0&lng=0&loc=Unspecified&alt=0&tz=UCT&size=800  SL=1&SN=1&BW=1&time=61085.28472&ecl=0&cb=0"
     query_params = {
-        "lat"       : f"{obs_gd_lat_deg:.6f}",
-        "lng"       : f"{obs_gd_lon_deg:.6f}",
-        "loc"       : "Unspecified",
-        "alt"       : f"{obs_gd_height*1000:.0f}",
-        "tz"        : f"{ha_timezone}",
+        **_obs_params(obs_gd_lon_deg, obs_gd_lat_deg, obs_gd_height, ha_timezone),
         "size"      : f"{ha_imgsize:.0f}",
         "SL"        : "1",
         "SN"        : "1",
@@ -460,12 +531,93 @@ def get_wholeskychart(
         "cb"        : "0"
         }
 
-    r = requests.get(SKYCHART_URL, params=query_params)
+    r = (session or _SESSION).get(SKYCHART_URL, params=query_params)
     r.raise_for_status()
     query_result = r.content
 
     return query_result
 
+async def get_pass_summary_async(*args, **kwargs):
+    """
+    Get satellite pass summary from heavens-above.com without blocking the event loop
+
+    Parameters
+    ----------
+    Same as `get_pass_summary`
+
+    Returns
+    -------
+    query_result: `str`
+        Satellite pass summary (HTML format)
+
+    Notes
+    -----
+        Request runs in the default executor of the running event loop.
+        Many satellites can be retrieved at the same time by asyncio.gather.
+        (c) 2026 Kiyoaki Okudaira - University of Washington / IAU CPS SatHub
+    """
+    return await asyncio.to_thread(get_pass_summary, *args, **kwargs)
+
+async def get_pass_detail_async(*args, **kwargs):
+    """
+    Get satellite pass detail from heavens-above.com without blocking the event loop
+
+    Parameters
+    ----------
+    Same as `get_pass_detail`
+
+    Returns
+    -------
+    query_result: `str`
+        Satellite pass detail (HTML format)
+
+    Notes
+    -----
+        Request runs in the default executor of the running event loop.
+        (c) 2026 Kiyoaki Okudaira - University of Washington / IAU CPS SatHub
+    """
+    return await asyncio.to_thread(get_pass_detail, *args, **kwargs)
+
+async def get_pass_chart_async(*args, **kwargs):
+    """
+    Get satellite pass chart from heavens-above.com without blocking the event loop
+
+    Parameters
+    ----------
+    Same as `get_pass_chart`
+
+    Returns
+    -------
+    query_result: `bytes`
+        Satellite pass chart image
+
+    Notes
+    -----
+        Request runs in the default executor of the running event loop.
+        (c) 2026 Kiyoaki Okudaira - University of Washington / IAU CPS SatHub
+    """
+    return await asyncio.to_thread(get_pass_chart, *args, **kwargs)
+
+async def get_wholeskychart_async(*args, **kwargs):
+    """
+    Get whole sky chart from heavens-above.com without blocking the event loop
+
+    Parameters
+    ----------
+    Same as `get_wholeskychart`
+
+    Returns
+    -------
+    query_result: `bytes`
+        Whole sky chart image
+
+    Notes
+    -----
+        Request runs in the default executor of the running event loop.
+        (c) 2026 Kiyoaki Okudaira - University of Washington / IAU CPS SatHub
+    """
+    return await asyncio.to_thread(get_wholeskychart, *args, **kwargs)
+
 
 #--------------------------------------------------------------------------------------------------#
 # Test                                                                                             #